@@ -3,7 +3,7 @@
     incremental_strategy = 'insert_overwrite',
     schema       = 'core',
     alias        = 'fact_price_features',
-    partition_by = { "field": "trade_date", "data_type": "date" },
+    partition_by = { "field": "trade_date", "data_type": "date", "granularity": "month" },
     cluster_by   = ['ticker'],
     tags         = ['core', 'fact', 'prices']
 ) }}
@@ -19,8 +19,8 @@ WITH base AS (
   FROM {{ ref('int_mag7_ta_benchmark') }}
   WHERE trade_date IS NOT NULL
   {% if is_incremental() %}
-    -- thin fact: only overwrite recent partitions
-    AND trade_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY)
+    -- thin fact: only overwrite recent partitions (whole months, see partition_by)
+    AND trade_date >= DATE_TRUNC(DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY), MONTH)
   {% endif %}
 ),
 
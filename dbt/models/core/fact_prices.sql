@@ -3,7 +3,7 @@
     incremental_strategy = 'insert_overwrite',
     schema       = 'core',
     alias        = 'fact_prices',
-    partition_by = { "field": "trade_date", "data_type": "date" },
+    partition_by = { "field": "trade_date", "data_type": "date", "granularity": "month" },
     cluster_by   = ['ticker'],
     tags         = ['core', 'fact', 'prices']
 ) }}
@@ -26,8 +26,9 @@ WITH base AS (
   FROM {{ ref('int_mag7_ta') }}
   WHERE trade_date IS NOT NULL
   {% if is_incremental() %}
-    -- small window is fine for a thin fact
-    AND trade_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY)
+    -- small window is fine for a thin fact; start on a month boundary since
+    -- insert_overwrite replaces whole (monthly) partitions
+    AND trade_date >= DATE_TRUNC(DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY), MONTH)
   {% endif %}
 ),
 
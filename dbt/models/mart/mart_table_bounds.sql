@@ -0,0 +1,24 @@
+{{ config(
+    materialized = 'table',
+    schema       = 'mart',
+    alias        = 'table_bounds',
+    tags         = ['mart', 'meta']
+) }}
+
+-- One row per app-facing price fact: date range + ticker list.
+-- Rebuilt with the facts, so the app reads one row instead of scanning them.
+SELECT
+    'fact_price_features'                       AS tbl,
+    MIN(trade_date)                             AS min_date,
+    MAX(trade_date)                             AS max_date,
+    ARRAY_AGG(DISTINCT ticker ORDER BY ticker)  AS tickers
+FROM {{ ref('fact_price_features') }}
+
+UNION ALL
+
+SELECT
+    'fact_prices'                               AS tbl,
+    MIN(trade_date)                             AS min_date,
+    MAX(trade_date)                             AS max_date,
+    ARRAY_AGG(DISTINCT ticker ORDER BY ticker)  AS tickers
+FROM {{ ref('fact_prices') }}
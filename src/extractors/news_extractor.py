@@ -23,6 +23,7 @@ Columns:
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import List, Dict
 from pathlib import Path
@@ -151,8 +152,6 @@ def parse_pubdate(pubdate_raw: str) -> str:
 
 def fetch_news_for_ticker(ticker: str, window: str) -> List[Dict]:
     url = build_google_news_url(ticker, window)
-    print(f"Fetching news for {ticker} with window={window}:")
-    print(f"  {url}")
 
     try:
         resp = requests.get(url, timeout=10)
@@ -188,16 +187,18 @@ def fetch_news_for_ticker(ticker: str, window: str) -> List[Dict]:
             }
         )
 
-    print(f"  Found {len(rows)} articles")
+    # one line per ticker: calls run on a thread pool, multi-line output interleaves
+    print(f"{ticker} (window={window}): found {len(rows)} articles <- {url}")
     return rows
 
 
 def run_news_extractor(tickers: List[str], window: str) -> Path | None:
     all_records: List[Dict] = []
 
-    for ticker in tickers:
-        recs = fetch_news_for_ticker(ticker, window)
-        all_records.extend(recs)
+    # RSS fetches are I/O-bound -> overlap them (map keeps ticker order)
+    with ThreadPoolExecutor(max_workers=max(1, len(tickers))) as ex:
+        for recs in ex.map(lambda t: fetch_news_for_ticker(t, window), tickers):
+            all_records.extend(recs)
 
     if not all_records:
         print("No news fetched.")
@@ -219,13 +219,13 @@ def download_prices(
         if data.columns.levels[0].isin(["Open", "High", "Low", "Close", "Adj Close", "Volume"]).any():
             data = data.swaplevel(axis=1)
 
-        records = []
-        for ticker in data.columns.levels[0]:
-            df_t = data[ticker].copy()
-            df_t["ticker"] = ticker
-            df_t["date"] = df_t.index.date
-            records.append(df_t.reset_index(drop=True))
-        df = pd.concat(records, ignore_index=True)
+        dates = data.index.date
+        records = [
+            # assign() returns the only new frame per ticker (no extra .copy())
+            data[ticker].assign(ticker=ticker, date=dates).reset_index(drop=True)
+            for ticker in data.columns.levels[0]
+        ]
+        df = pd.concat(records, ignore_index=True, sort=False)
     else:
         # Single ticker case
         ticker = tickers[0]
@@ -5,6 +5,8 @@
 # - Optional title + optional regime caption text
 
 import math
+from functools import lru_cache
+
 import plotly.graph_objects as go
 
 
@@ -15,7 +17,18 @@ def fear_greed_dial(
     show_title: bool = True,
     height: int = 240,
 ) -> go.Figure:
-    v = max(0.0, min(100.0, float(value)))
+    """
+    Fear & Greed dial for a 0-100 value.
+
+    The value is clamped and rounded to an integer (what the dial displays),
+    so reruns reuse a memoized figure. Treat the returned figure as read-only.
+    """
+    v = int(round(max(0.0, min(100.0, float(value)))))
+    return _build_dial(v, title, show_title, height)
+
+
+@lru_cache(maxsize=256)
+def _build_dial(v: int, title: str, show_title: bool, height: int) -> go.Figure:
 
     # CNN-ish bands
     bands = [
@@ -97,7 +110,7 @@ def fear_greed_dial(
     fig.add_annotation(
         x=0.5,
         y=0.52,
-        text=f"<b>{int(round(v))}</b>",
+        text=f"<b>{v}</b>",
         showarrow=False,
         font=dict(size=44, color="#14213d"),
     )
@@ -27,6 +27,17 @@ BQ_DATASET_MART = os.getenv("BQ_DATASET_MART", "mag7_intel_mart")
 if not GCP_PROJECT_ID:
     raise RuntimeError("GCP_PROJECT_ID is not set (check .env or environment).")
 
+# ---------------------------------------------------------------------
+# Query Result Cache (optional)
+# ---------------------------------------------------------------------
+
+# Parquet copies of query results shared across app processes / cold starts
+# (local dir or mounted volume). Unset = disabled. On a GCS FUSE mount
+# renames are not atomic, so a reader can hit a partial file; it is then
+# treated as a miss and re-queried.
+QUERY_CACHE_DIR = os.getenv("QUERY_CACHE_DIR")
+QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "300"))  # seconds; default when run_query gets no cache_ttl
+
 # ---------------------------------------------------------------------
 # Canonical Table References
 # ---------------------------------------------------------------------
@@ -55,6 +66,7 @@ TABLE_MART_REGIME_SUMMARY      = f"{GCP_PROJECT_ID}.{BQ_DATASET_MART}.regime_sum
 TABLE_MART_TICKER_OVERVIEW     = f"{GCP_PROJECT_ID}.{BQ_DATASET_MART}.research_ticker_profile"
 TABLE_MART_PRICE_SUMMARY       = f"{GCP_PROJECT_ID}.{BQ_DATASET_MART}.price_summary"
 TABLE_MART_MARKET_SENTIMENT_TS = f"{GCP_PROJECT_ID}.{BQ_DATASET_MART}.market_sentiment_ts"
+TABLE_MART_TABLE_BOUNDS        = f"{GCP_PROJECT_ID}.{BQ_DATASET_MART}.table_bounds"
 # ---------------------------------------------------------------------
 # App Defaults
 # ---------------------------------------------------------------------
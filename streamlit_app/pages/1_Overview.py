@@ -1,19 +1,19 @@
 # pages/overview.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 
 from utils.data_loaders import (
-    load_overview_signal_snapshot,
-    load_overview_macro_snapshot,
-    load_overview_today,
+    load_overview_bundle,
     load_overview_trending,
 )
 from components.banners import production_truth_banner
 from components.metrics import kpi_row
 from components.freshness import data_freshness_panel
 from components.gauges import fear_greed_dial
-from utils.constants import S0_SIGNAL_COLORS
+from utils.constants import S0_SIGNAL_BADGES
+from utils.plot_helpers import lttb_indices, vrect_shapes
 
 st.set_page_config(
     page_title="Overview | Market Control Center",
@@ -30,9 +30,11 @@ production_truth_banner()
 # Load snapshots
 # ---------------------------------------------------------------------
 with st.spinner("Loading overview snapshots…"):
-    snap_signal = load_overview_signal_snapshot()
-    snap_macro = load_overview_macro_snapshot()
-    today_df = load_overview_today()
+    bundle = load_overview_bundle()
+
+snap_signal = bundle["signal"]
+snap_macro = bundle["macro"]
+today_df = bundle["today"]
 
 if snap_signal.empty or snap_macro.empty or today_df.empty:
     st.error("No overview data available (snapshot tables returned empty).")
@@ -58,17 +60,21 @@ data_freshness_panel(
 with st.sidebar:
     st.markdown("## Controls")
 
-    window = st.selectbox(
-        "Time window",
-        ["3m", "6m", "1y", "2y", "max"],
-        index=2,
-    )
+    # batch control changes -> one rerun on Apply instead of one per widget
+    with st.form("controls"):
+        window = st.selectbox(
+            "Time window",
+            ["3m", "6m", "1y", "2y", "max"],
+            index=2,
+        )
 
-    price_mode = st.radio(
-        "Chart mode",
-        ["Price", "Indexed (100)", "Cumulative Return"],
-        horizontal=False,
-    )
+        price_mode = st.radio(
+            "Chart mode",
+            ["Price", "Indexed (100)", "Cumulative Return"],
+            horizontal=False,
+        )
+
+        st.form_submit_button("Apply")
 
 # ---------------------------------------------------------------------
 # Top row — Control Center
@@ -122,13 +128,14 @@ start_date = None
 if window != "max":
     start_date = (asof_date - pd.Timedelta(days=start_map[window])).strftime("%Y-%m-%d")
 
-trend_df = load_overview_trending(start_date)
+trend_df = load_overview_trending(
+    start_date,
+    columns=["trade_date", "ticker", "adj_close", "return_1d", "fear_greed"],
+)
 if trend_df.empty:
     st.warning("No trending data available for selected window.")
     st.stop()
 
-trend_df["trade_date"] = pd.to_datetime(trend_df["trade_date"])
-
 # --- Controls for what to show ---
 all_equities = sorted([t for t in trend_df["ticker"].unique() if not str(t).startswith("^")])
 bench_candidates = [t for t in ["^NDX", "^NDXE"] if t in trend_df["ticker"].unique()]
@@ -148,76 +155,100 @@ with st.expander("Chart filters", expanded=False):
     fng_show_line = st.checkbox("Also show Fear & Greed line (secondary axis)", value=False)
 
 # --- Build figure ---
-fig = go.Figure()
+# collect traces/shapes, then validate once in go.Figure(...)
+traces = []
+shapes = []
 
 # Helper to transform series by mode
-def _transform_series(sub: pd.DataFrame) -> pd.Series:
-    y = sub["adj_close"].astype(float)
-
-    if price_mode == "Indexed (100)":
-        return 100 * y / y.iloc[0]
-    if price_mode == "Cumulative Return":
-        r = sub["return_1d"].astype(float).fillna(0.0)
-        return (1 + r).cumprod()
+def _transform_series(sub: pd.DataFrame, mode: str) -> np.ndarray:
+    y = sub["adj_close"].to_numpy()
+
+    if mode == "Indexed (100)":
+        return 100 * y / y[0]
+    if mode == "Cumulative Return":
+        r = np.nan_to_num(sub["return_1d"].to_numpy(dtype=np.float32), nan=0.0)
+        return np.cumprod(1.0 + r)
     return y
 
+# Long windows: decimate each line to a visually faithful polyline.
+# Target well below the trigger so a line just over it isn't run through
+# a full-size LTTB pass to drop a handful of points.
+LTTB_TRIGGER_POINTS = 2000
+LTTB_TARGET_POINTS = 1000
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _line_xy(
+    ticker: str,
+    window: str,
+    start_date: str | None,
+    mode: str,
+    _sub: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    x / y arrays for one ticker line (transformed, decimated on long windows).
+    Cached so filter toggles in the expander don't redo the work.
+    """
+    x = _sub["trade_date"].to_numpy()
+    y = _transform_series(_sub, mode)
+    if len(y) > LTTB_TRIGGER_POINTS:
+        keep = lttb_indices(x.astype("int64"), y, LTTB_TARGET_POINTS)
+        x, y = x[keep], y[keep]
+    return x, y
+
+# Daily FnG series (same value for every ticker on a date) -> once for shading + line
+fg = (
+    trend_df.groupby("trade_date", sort=True, as_index=False)["fear_greed"].first().dropna()
+    if "fear_greed" in trend_df.columns
+    else pd.DataFrame(columns=["trade_date", "fear_greed"])
+)
+
 # --- (A) FnG background shading bands ---
-# Use daily FnG series (unique by date). We'll add vrect bands.
-if fng_shading and "fear_greed" in trend_df.columns:
-    fg = (
-        trend_df.drop_duplicates("trade_date")[["trade_date", "fear_greed"]]
-        .sort_values("trade_date")
-        .dropna()
+# Contiguous days in the same band -> one vrect each.
+if fng_shading and not fg.empty:
+    # map FnG value to regime band: <25, <45, <55, <75, else
+    band_names = np.array(["extreme_fear", "fear", "neutral", "greed", "extreme_greed"])
+    band_idx = np.searchsorted(np.array([25, 45, 55, 75]), fg["fear_greed"].to_numpy(), side="right")
+
+    # compress contiguous dates with same band -> fewer shapes
+    starts = np.r_[0, np.flatnonzero(np.diff(band_idx) != 0) + 1]
+    ends = np.r_[starts[1:], len(band_idx)] - 1
+    dates = fg["trade_date"].to_numpy()
+    spans = pd.DataFrame({
+        "band": band_names[band_idx[starts]],
+        "x0": dates[starts],
+        "x1": dates[ends],
+    })
+
+    # band colors (light transparency)
+    band_fill = {
+        "extreme_fear": "rgba(178,34,34,0.10)",
+        "fear":         "rgba(255,127,14,0.10)",
+        "neutral":      "rgba(211,211,211,0.10)",
+        "greed":        "rgba(44,160,44,0.10)",
+        "extreme_greed":"rgba(0,100,0,0.10)",
+    }
+
+    # extend x1 by 1 day so the band covers the last day visually
+    shapes = vrect_shapes(
+        spans["x0"],
+        spans["x1"] + pd.Timedelta(days=1),
+        spans["band"].map(band_fill).fillna("rgba(200,200,200,0.08)"),
     )
-    if not fg.empty:
-        # map FnG value to regime band
-        def _band(x: float) -> str:
-            if x < 25: return "extreme_fear"
-            if x < 45: return "fear"
-            if x < 55: return "neutral"
-            if x < 75: return "greed"
-            return "extreme_greed"
-
-        fg["band"] = fg["fear_greed"].apply(_band)
-
-        # compress contiguous dates with same band -> fewer shapes
-        fg["band_change"] = (fg["band"] != fg["band"].shift(1)).cumsum()
-        spans = fg.groupby("band_change").agg(
-            band=("band", "first"),
-            x0=("trade_date", "min"),
-            x1=("trade_date", "max"),
-        ).reset_index(drop=True)
-
-        # band colors (light transparency)
-        band_fill = {
-            "extreme_fear": "rgba(178,34,34,0.10)",
-            "fear":         "rgba(255,127,14,0.10)",
-            "neutral":      "rgba(211,211,211,0.10)",
-            "greed":        "rgba(44,160,44,0.10)",
-            "extreme_greed":"rgba(0,100,0,0.10)",
-        }
-
-        for _, row in spans.iterrows():
-            # extend x1 by 1 day so the band covers the last day visually
-            fig.add_vrect(
-                x0=row["x0"],
-                x1=row["x1"] + pd.Timedelta(days=1),
-                fillcolor=band_fill.get(row["band"], "rgba(200,200,200,0.08)"),
-                opacity=1.0,
-                line_width=0,
-                layer="below",
-            )
+
+# one sort + hash pass by ticker -> positional indices (rows already in date order)
+trend_df = trend_df.sort_values(["ticker", "trade_date"])
+idx_by_ticker = trend_df.groupby("ticker", sort=False).indices
 
 # --- (B) Equity lines ---
 for ticker in show_equities:
-    sub = trend_df[trend_df["ticker"] == ticker].sort_values("trade_date")
-    if sub.empty:
+    pos = idx_by_ticker.get(ticker)
+    if pos is None or len(pos) == 0:
         continue
-    y = _transform_series(sub)
+    x, y = _line_xy(ticker, window, start_date, price_mode, trend_df.iloc[pos])
 
-    fig.add_trace(
-        go.Scatter(
-            x=sub["trade_date"],
+    traces.append(
+        go.Scattergl(
+            x=x,
             y=y,
             name=ticker,
             mode="lines",
@@ -227,14 +258,14 @@ for ticker in show_equities:
 
 # --- (C) Benchmark lines ---
 for bench in show_bench:
-    sub = trend_df[trend_df["ticker"] == bench].sort_values("trade_date")
-    if sub.empty:
+    pos = idx_by_ticker.get(bench)
+    if pos is None or len(pos) == 0:
         continue
-    y = _transform_series(sub)
+    x, y = _line_xy(bench, window, start_date, price_mode, trend_df.iloc[pos])
 
-    fig.add_trace(
-        go.Scatter(
-            x=sub["trade_date"],
+    traces.append(
+        go.Scattergl(
+            x=x,
             y=y,
             name=bench,
             mode="lines",
@@ -243,39 +274,37 @@ for bench in show_bench:
     )
 
 # --- (D) Optional FnG line on secondary axis (for debugging / reference) ---
-if fng_show_line and "fear_greed" in trend_df.columns:
-    fg = (
-        trend_df.drop_duplicates("trade_date")[["trade_date", "fear_greed"]]
-        .sort_values("trade_date")
-        .dropna()
-    )
-    if not fg.empty:
-        fig.add_trace(
-            go.Scatter(
-                x=fg["trade_date"],
-                y=fg["fear_greed"],
-                name="Fear & Greed",
-                yaxis="y2",
-                mode="lines",
-                line=dict(width=1),
-                opacity=0.35,
-            )
+if fng_show_line and not fg.empty:
+    traces.append(
+        go.Scattergl(
+            x=fg["trade_date"],
+            y=fg["fear_greed"],
+            name="Fear & Greed",
+            yaxis="y2",
+            mode="lines",
+            line=dict(width=1),
+            opacity=0.35,
         )
+    )
 
-fig.update_layout(
-    height=440,
-    margin=dict(l=10, r=10, t=10, b=10),
-    xaxis=dict(title=""),
-    yaxis=dict(title=price_mode),
-    yaxis2=dict(
-        title="Fear & Greed",
-        overlaying="y",
-        side="right",
-        range=[0, 100],
-        showgrid=False,
-        visible=fng_show_line,  # only show the axis if line is enabled
+fig = go.Figure(
+    data=traces,
+    layout=dict(
+        height=440,
+        margin=dict(l=10, r=10, t=10, b=10),
+        xaxis=dict(title=""),
+        yaxis=dict(title=price_mode),
+        yaxis2=dict(
+            title="Fear & Greed",
+            overlaying="y",
+            side="right",
+            range=[0, 100],
+            showgrid=False,
+            visible=fng_show_line,  # only show the axis if line is enabled
+        ),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+        shapes=shapes,
     ),
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
 )
 
 st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
@@ -287,10 +316,6 @@ st.divider()
 # ---------------------------------------------------------------------
 st.subheader("📋 Today Snapshot — Sentiment, TA & Signal")
 
-def highlight_state(val: str) -> str:
-    color = S0_SIGNAL_COLORS.get(val, "#FFFFFF")
-    return f"background-color: {color}; color: white;"
-
 preferred_cols = [
     "trade_date",
     "ticker",
@@ -317,33 +342,35 @@ preferred_cols = [
 cols = [c for c in preferred_cols if c in today_df.columns]
 table_df = today_df[cols] if cols else today_df
 
-styled = (
-    table_df.sort_values("ticker")
-    .style
-    .applymap(
-        highlight_state,
-        subset=["core_signal_state"] if "core_signal_state" in table_df.columns else [],
-    )
-    .format(
-        {
-            "adj_close": "{:.2f}",
-            "return_1d": "{:.2%}",
-            "return_5d": "{:.2%}",
-            "return_20d": "{:.2%}",
-            "vola_20d": "{:.2%}",
-            "atr_14": "{:.2f}",
-            "rsi_14": "{:.1f}",
-            "core_score": "{:.1f}",
-            "sentiment_mean": "{:.3f}",
-            "finbert_net_ma7": "{:.3f}",
-        }
+# Formatting is done by the frontend via column_config (no per-cell Styler callbacks).
+# Percent columns are scaled here since printf formats can't multiply by 100.
+pct_cols = [c for c in ["return_1d", "return_5d", "return_20d", "vola_20d"] if c in table_df.columns]
+table_df = table_df.sort_values("ticker")
+table_df = table_df.assign(**{c: table_df[c] * 100 for c in pct_cols})
+if "core_signal_state" in table_df.columns:
+    table_df = table_df.assign(
+        core_signal_state=table_df["core_signal_state"].map(
+            lambda s: f"{S0_SIGNAL_BADGES.get(s, '')} {s}".strip(),
+            na_action="ignore",
+        )
     )
-)
+
+num_col = st.column_config.NumberColumn
+column_config = {
+    "adj_close": num_col(format="%.2f"),
+    "atr_14": num_col(format="%.2f"),
+    "rsi_14": num_col(format="%.1f"),
+    "core_score": num_col(format="%.1f"),
+    "sentiment_mean": num_col(format="%.3f"),
+    "finbert_net_ma7": num_col(format="%.3f"),
+    **{c: num_col(format="%.2f%%") for c in pct_cols},
+}
 
 st.dataframe(
-    styled,
+    table_df,
     use_container_width=True,
     hide_index=True,
+    column_config=column_config,
 )
 
 st.caption(
@@ -2,8 +2,6 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 
 from components.banners import production_truth_banner
 from components.freshness import data_freshness_panel
@@ -11,9 +9,10 @@ from components.metrics import kpi_row
 
 from utils.data_loaders import (
     load_price_macro,
-    load_available_tickers,
-    load_date_bounds,
+    load_price_macro_corr,
+    load_sidebar_meta,
 )
+from utils.plot_helpers import linfit, lttb_indices, vrect_shapes
 
 st.set_page_config(
     page_title="Stock + Macro | MAG7 Intel",
@@ -32,7 +31,7 @@ production_truth_banner()
 with st.sidebar:
     st.subheader("Filters")
 
-    all_tickers = load_available_tickers()
+    all_tickers, min_date, max_date = load_sidebar_meta()
     if not all_tickers:
         st.error("No tickers found in core price table.")
         st.stop()
@@ -40,10 +39,6 @@ with st.sidebar:
     default_tickers = all_tickers[:1]
     tickers = st.multiselect("Ticker(s)", all_tickers, default=default_tickers)
 
-    min_date_str, max_date_str = load_date_bounds()
-    min_date = pd.to_datetime(min_date_str).date()
-    max_date = pd.to_datetime(max_date_str).date()
-
     st.markdown("---")
     st.subheader("Time Period")
 
@@ -72,11 +67,19 @@ with st.sidebar:
 # ----------------------------
 # Load data
 # ----------------------------
+# Price panel + KPIs only; the analysis tabs fetch their own columns below
+PRICE_PANEL_COLUMNS = [
+    "open", "high", "low", "adj_close", "volume",
+    "ma_20", "ma_50", "ma_200",
+    "fear_greed", "fg_band",
+]
+
 with st.spinner("Loading from BigQuery…"):
     df = load_price_macro(
         tickers=tickers,
         start_date=str(start_date),
         end_date=str(end_date),
+        columns=PRICE_PANEL_COLUMNS,
     )
 
 if df.empty:
@@ -97,8 +100,7 @@ if len(tickers) > 1:
 else:
     selected_ticker = tickers[0]
 
-df_t = df[df["ticker"] == selected_ticker].copy()
-df_t["fear_greed"] = df_t["fear_greed"].fillna(50)  # neutral fill for viz
+df_t = df.loc[df["ticker"] == selected_ticker]  # read-only below; no copy needed
 
 # ----------------------------
 # KPIs row
@@ -108,123 +110,156 @@ kpis = [
     ("As of", latest["trade_date"].strftime("%Y-%m-%d")),
     ("Adj Close", f"{latest['adj_close']:.2f}"),
     ("Volume", f"{int(latest['volume']):,}" if pd.notna(latest["volume"]) else "—"),
-    ("Fear/Greed", f"{int(latest['fear_greed']):d}" if pd.notna(latest["fear_greed"]) else "—"),
+    ("Fear/Greed", f"{int(latest['fear_greed']):d}"),
 ]
 kpi_row(kpis)
 
 # ----------------------------
 # Price chart with Fear/Greed shading background
 # ----------------------------
-fig = make_subplots(
-    rows=2, cols=1,
-    shared_xaxes=True,
-    vertical_spacing=0.06,
-    row_heights=[0.72, 0.28],
-)
-
-# Background shading bands (simple 4-zone)
-# 0-25 Extreme Fear, 25-50 Fear, 50-75 Greed, 75-100 Extreme Greed
-bands = [
-    (0, 25, "rgba(220, 20, 60, 0.10)"),
-    (25, 50, "rgba(255, 140, 0, 0.08)"),
-    (50, 75, "rgba(50, 205, 50, 0.07)"),
-    (75, 100, "rgba(0, 128, 0, 0.08)"),
-]
+# Figure build is cached apart from the data: widget toggles further down
+# (trendline, horizon) rerun the script but reuse the built figure.
+# data_hash keys the entry so a data refresh still rebuilds it.
+LTTB_MAX_POINTS = 2000
+
+
+def _frame_hash(frame: pd.DataFrame) -> int:
+    return int(pd.util.hash_pandas_object(frame, index=False).sum())
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _build_price_figure(
+    ticker: str,
+    start: str,
+    end: str,
+    data_hash: int,
+    _df: pd.DataFrame,
+) -> go.Figure:
+    # imported on first build only (after the empty-selection stop above)
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.06,
+        row_heights=[0.72, 0.28],
+    )
 
-# Create a normalized (0-100) series on secondary hidden axis via filled area trick:
-# We draw filled areas using scatter with y in [band_low, band_high] and fill='tonexty' style.
-x = df_t["trade_date"]
-
-# Start with baseline at 0
-fig.add_trace(
-    go.Scatter(
-        x=x, y=np.zeros(len(df_t)),
-        mode="lines",
-        line=dict(width=0),
-        hoverinfo="skip",
-        showlegend=False,
-        name="baseline",
-    ),
-    row=1, col=1,
-)
+    # Background shading bands (simple 4-zone, fg_band comes from SQL)
+    # 0-25 Extreme Fear, 25-50 Fear, 50-75 Greed, 75-100 Extreme Greed
+    band_colors = np.array([
+        "rgba(220, 20, 60, 0.10)",
+        "rgba(255, 140, 0, 0.08)",
+        "rgba(50, 205, 50, 0.07)",
+        "rgba(0, 128, 0, 0.08)",
+    ])
+
+    # one rect per contiguous run of the same band, running up to the next run's start
+    band = _df["fg_band"].to_numpy()
+    dates = _df["trade_date"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, band[1:] != band[:-1]])
+    ends = np.r_[starts[1:], len(band) - 1]
+    fig.update_layout(
+        shapes=vrect_shapes(dates[starts], dates[ends], band_colors[band[starts]], yref="y domain")
+    )
 
-# For each band, draw y=band_high and fill to previous, but only where fear_greed within band
-fg = df_t["fear_greed"].to_numpy()
+    # Long ranges: LTTB on Adj Close picks the rows the price/MA traces share
+    # (volume bars stay full-resolution so spikes aren't dropped)
+    if len(_df) > LTTB_MAX_POINTS:
+        keep = lttb_indices(dates.astype("int64"), _df["adj_close"].to_numpy(), LTTB_MAX_POINTS)
+        plot_df = _df.iloc[keep]
+    else:
+        plot_df = _df
+
+    hover_template = (
+        "<b>Date:</b> %{x|%Y-%m-%d}<br>"
+        "<b>Adj Close:</b> %{y:.2f}<br>"
+        "<b>Open/High/Low:</b> %{customdata[0]:.2f} / %{customdata[1]:.2f} / %{customdata[2]:.2f}<br>"
+        "<b>Fear/Greed:</b> %{customdata[3]:.0f}"
+        "<extra></extra>"
+    )
+    # one contiguous float32 block: half the bytes of float64, and plotly>=6
+    # ships it as a base64 typed array instead of per-point JSON numbers.
+    # Volume stays out: float32 can't hold it exactly past 2**24, so the bars
+    # below carry it at full precision and show it in their own hover.
+    custom_data = np.ascontiguousarray(
+        plot_df[["open", "high", "low", "fear_greed"]].to_numpy(dtype=np.float32)
+    )
 
-prev = np.zeros(len(df_t))
-for low, high, color in bands:
-    y = np.where((fg >= low) & (fg < high), high, prev)
+    # Price line (WebGL: long Custom ranges stay responsive)
     fig.add_trace(
-        go.Scatter(
-            x=x, y=y,
+        go.Scattergl(
+            x=plot_df["trade_date"],
+            y=plot_df["adj_close"],
             mode="lines",
-            line=dict(width=0),
-            fill="tonexty",
-            fillcolor=color,
-            hoverinfo="skip",
-            showlegend=False,
+            name="Adj Close",
+            customdata=custom_data,
+            hovertemplate=hover_template,
         ),
         row=1, col=1,
     )
-    prev = y
-
-hover_template = (
-    "<b>Date:</b> %{x|%Y-%m-%d}<br>"
-    "<b>Adj Close:</b> %{y:.2f}<br>"
-    "<b>Open/High/Low:</b> %{customdata[0]:.2f} / %{customdata[1]:.2f} / %{customdata[2]:.2f}<br>"
-    "<b>Volume:</b> %{customdata[3]:,.0f}<br>"
-    "<b>Fear/Greed:</b> %{customdata[4]:.0f}"
-    "<extra></extra>"
-)
-custom_data = df_t[["open", "high", "low", "volume", "fear_greed"]].values
-
-# Price line
-fig.add_trace(
-    go.Scatter(
-        x=df_t["trade_date"],
-        y=df_t["adj_close"],
-        mode="lines",
-        name="Adj Close",
-        customdata=custom_data,
-        hovertemplate=hover_template,
-    ),
-    row=1, col=1,
-)
 
-# Moving averages (only if present)
-for ma in ["ma_20", "ma_50", "ma_200"]:
-    if ma in df_t.columns and df_t[ma].notna().any():
-        fig.add_trace(
-            go.Scatter(
-                x=df_t["trade_date"],
-                y=df_t[ma],
-                mode="lines",
-                name=ma.upper(),
-                line=dict(width=1),
-            ),
-            row=1, col=1,
-        )
+    # Moving averages (only if present)
+    for ma in ["ma_20", "ma_50", "ma_200"]:
+        if ma in plot_df.columns and plot_df[ma].notna().any():
+            fig.add_trace(
+                go.Scattergl(
+                    x=plot_df["trade_date"],
+                    y=plot_df[ma],
+                    mode="lines",
+                    name=ma.upper(),
+                    line=dict(width=1),
+                ),
+                row=1, col=1,
+            )
 
-# Volume bars (neutral)
-fig.add_trace(
-    go.Bar(
-        x=df_t["trade_date"],
-        y=df_t["volume"],
-        name="Volume",
-        opacity=0.85,
-    ),
-    row=2, col=1,
-)
+    # Volume bars (neutral)
+    fig.add_trace(
+        go.Bar(
+            x=_df["trade_date"],
+            y=_df["volume"],
+            name="Volume",
+            hovertemplate="<b>Volume:</b> %{y:,.0f}<extra></extra>",
+            opacity=0.85,
+        ),
+        row=2, col=1,
+    )
 
-fig.update_layout(
-    height=650,
-    template="plotly_dark",
-    title=f"{selected_ticker} • Price + Volume (Fear/Greed shaded background)",
-    hovermode="x unified",
-    legend=dict(orientation="h", y=1.02, x=0, xanchor="left"),
-    margin=dict(l=10, r=10, t=60, b=10),
-)
-fig.update_xaxes(rangeslider_visible=False)
+    fig.update_layout(
+        height=650,
+        template="plotly_dark",
+        title=f"{ticker} • Price + Volume (Fear/Greed shaded background)",
+        hovermode="x unified",
+        legend=dict(orientation="h", y=1.02, x=0, xanchor="left"),
+        margin=dict(l=10, r=10, t=60, b=10),
+    )
+    fig.update_xaxes(rangeslider_visible=False)
+    return fig
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _build_corr_heatmap(
+    ticker: str,
+    start: str,
+    end: str,
+    data_hash: int,
+    _corr: pd.DataFrame,
+) -> go.Figure:
+    import plotly.express as px
+
+    fig_hm = px.imshow(
+        _corr,
+        text_auto=".2f",
+        aspect="auto",
+        zmin=-1, zmax=1,
+        labels=dict(x="Indicator", y="Forward Return", color="Corr"),
+    )
+    fig_hm.update_layout(template="plotly_dark", height=520)
+    return fig_hm
+
+
+data_hash = _frame_hash(df_t)
+fig = _build_price_figure(selected_ticker, str(start_date), str(end_date), data_hash, df_t)
 st.plotly_chart(fig, use_container_width=True)
 
 # ----------------------------
@@ -243,9 +278,11 @@ indicator_vars = [
     "put_call", "volatility", "volatility_50",
     "safe_haven", "junk_bonds",
 ]
-available_indicators = [c for c in indicator_vars if c in df_t.columns]
 
 with tab1:
+    # plotly.express is heavy; defer its import until the price panel is already sent
+    import plotly.express as px
+
     c1, c2 = st.columns([1, 2])
 
     with c1:
@@ -256,11 +293,22 @@ with tab1:
             "fwd_return_20d": "20D",
         }
         y_col = st.selectbox("Return horizon (Y)", return_vars, format_func=lambda x: horizon_labels[x])
-        x_col = st.selectbox("Indicator (X)", available_indicators, index=0)
+        x_col = st.selectbox("Indicator (X)", indicator_vars, index=0)
         add_trend = st.toggle("Add simple trendline", value=True)
 
     with c2:
-        scatter_df = df_t[[x_col, y_col, "volume"]].dropna()
+        # only the selected pair (+ volume for marker size) is fetched
+        pair_df = load_price_macro(
+            tickers=[selected_ticker],
+            start_date=str(start_date),
+            end_date=str(end_date),
+            columns=[x_col, y_col, "volume"],
+        )
+        scatter_df = (
+            pair_df[[x_col, y_col, "volume"]].dropna()
+            if not pair_df.empty
+            else pair_df
+        )
         if scatter_df.empty:
             st.warning("Not enough data points after dropping NaNs.")
         else:
@@ -270,6 +318,7 @@ with tab1:
                 y=y_col,
                 size="volume",
                 hover_data=["volume"],
+                render_mode="webgl",
                 labels={x_col: x_col.replace("_", " ").title(), y_col: "Forward Return"},
                 title=f"{selected_ticker}: {x_col} vs {horizon_labels[y_col]} forward return",
             )
@@ -280,7 +329,7 @@ with tab1:
                 # simple least-squares line (no statsmodels dependency)
                 x_vals = scatter_df[x_col].astype(float).to_numpy()
                 y_vals = scatter_df[y_col].astype(float).to_numpy()
-                m, b = np.polyfit(x_vals, y_vals, 1)
+                m, b = linfit(x_vals, y_vals)
                 x_line = np.linspace(np.nanmin(x_vals), np.nanmax(x_vals), 50)
                 y_line = m * x_line + b
                 fig_scatter.add_trace(go.Scatter(x=x_line, y=y_line, mode="lines", name="Trend"))
@@ -288,22 +337,23 @@ with tab1:
             st.plotly_chart(fig_scatter, use_container_width=True)
 
 with tab2:
-    st.caption("Correlation computed after dropping rows with missing values.")
-    avail_returns = [c for c in return_vars if c in df_t.columns]
-    if not available_indicators or not avail_returns:
-        st.warning("Missing return or indicator columns.")
+    st.caption("Pairwise-complete correlation (each pair uses the days where both values exist), computed in BigQuery.")
+    corr_long = load_price_macro_corr(
+        selected_ticker,
+        str(start_date),
+        str(end_date),
+        returns=tuple(return_vars),
+        indicators=tuple(indicator_vars),
+    )
+    if corr_long["corr"].isna().all():
+        st.warning("Not enough overlapping data to compute correlations.")
     else:
-        corr_df = df_t[avail_returns + available_indicators].dropna()
-        if corr_df.empty:
-            st.warning("No rows left after dropping NaNs.")
-        else:
-            corr = corr_df.corr(numeric_only=True).loc[avail_returns, available_indicators]
-            fig_hm = px.imshow(
-                corr,
-                text_auto=".2f",
-                aspect="auto",
-                zmin=-1, zmax=1,
-                labels=dict(x="Indicator", y="Forward Return", color="Corr"),
-            )
-            fig_hm.update_layout(template="plotly_dark", height=520)
-            st.plotly_chart(fig_hm, use_container_width=True)
+        # 4 x 10 matrix, rows/cols in the page's display order
+        corr = (
+            corr_long.pivot(index="ret", columns="ind", values="corr")
+            .reindex(index=return_vars, columns=indicator_vars)
+        )
+        fig_hm = _build_corr_heatmap(
+            selected_ticker, str(start_date), str(end_date), _frame_hash(corr), corr,
+        )
+        st.plotly_chart(fig_hm, use_container_width=True)
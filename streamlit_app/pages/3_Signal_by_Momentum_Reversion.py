@@ -8,6 +8,7 @@ from components.banners import production_truth_banner
 from components.metrics import kpi_row
 from components.freshness import data_freshness_panel
 from utils.constants import S1_SIGNAL_COLORS
+from utils.plot_helpers import vrect_shapes
 
 st.set_page_config(
     page_title="S1 MOM/REV Signal | Shading + Evidence",
@@ -63,7 +64,6 @@ if hist.empty:
     st.warning(f"No history found for ticker: {selected_ticker}")
     st.stop()
 
-hist = hist.copy()
 hist["trade_date"] = pd.to_datetime(hist["trade_date"])
 hist = hist.sort_values("trade_date")
 
@@ -178,19 +178,11 @@ def _contiguous_blocks(df: pd.DataFrame):
 def _chart_shading(df: pd.DataFrame) -> go.Figure:
     fig = go.Figure()
 
-    for x0, x1, state in _contiguous_blocks(df):
-        fig.add_shape(
-            type="rect",
-            xref="x",
-            yref="paper",
-            x0=x0,
-            x1=x1,
-            y0=0,
-            y1=1,
-            fillcolor=STATE_TO_RGBA.get(state, STATE_TO_RGBA["NEU"]),
-            line=dict(width=0),
-            layer="below",
-        )
+    blocks = list(_contiguous_blocks(df))
+    if blocks:
+        x0s, x1s, states = zip(*blocks)
+        fills = [STATE_TO_RGBA.get(s, STATE_TO_RGBA["NEU"]) for s in states]
+        fig.update_layout(shapes=vrect_shapes(x0s, x1s, fills))
 
     fig.add_trace(go.Scatter(
         x=df["trade_date"], y=df["adj_close"],
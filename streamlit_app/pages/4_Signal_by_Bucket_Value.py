@@ -59,7 +59,6 @@ if hist.empty:
     st.warning(f"No history found for ticker: {selected_ticker}")
     st.stop()
 
-hist = hist.copy()
 hist["trade_date"] = pd.to_datetime(hist["trade_date"])
 hist = hist.sort_values("trade_date")
 
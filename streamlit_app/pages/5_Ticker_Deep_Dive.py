@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 
 from utils.data_loaders import      \
@@ -35,7 +36,6 @@ if latest_df.empty:
     st.error("No data found in `signal_core`.")
     st.stop()
 
-latest_df = latest_df.copy()
 latest_df["trade_date"] = pd.to_datetime(latest_df["trade_date"])
 asof_date = latest_df["trade_date"].max()
 tickers = sorted(latest_df["ticker"].unique())
@@ -65,18 +65,20 @@ if sig_hist.empty:
     st.warning(f"No signal history found for {selected_ticker}")
     st.stop()
 
-sig_hist = sig_hist.copy()
 sig_hist["trade_date"] = pd.to_datetime(sig_hist["trade_date"])
 sig_hist = sig_hist.sort_values("trade_date")
 
 with st.spinner(f"Loading price corridor for {selected_ticker}…"):
-    px = load_price_corridor_history(selected_ticker)
+    # only dates the signal history can overlap (page shows the intersection)
+    px = load_price_corridor_history(
+        selected_ticker,
+        start_date=sig_hist["trade_date"].min().strftime("%Y-%m-%d"),
+    )
 
 if px.empty:
     st.warning(f"No price history found for {selected_ticker}")
     st.stop()
 
-px = px.copy()
 px["trade_date"] = pd.to_datetime(px["trade_date"])
 px = px.sort_values("trade_date")
 
@@ -98,8 +100,17 @@ with st.sidebar:
 
 start_date, end_date = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
 
-sig_hist = sig_hist[(sig_hist["trade_date"] >= start_date) & (sig_hist["trade_date"] <= end_date)]
-px = px[(px["trade_date"] >= start_date) & (px["trade_date"] <= end_date)]
+
+def _slice_date_range(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    # frames are sorted by trade_date above -> binary search the bounds, no full mask
+    dates = df["trade_date"].to_numpy()
+    lo = np.searchsorted(dates, start.to_datetime64(), side="left")
+    hi = np.searchsorted(dates, end.to_datetime64(), side="right")
+    return df.iloc[lo:hi]
+
+
+sig_hist = _slice_date_range(sig_hist, start_date, end_date)
+px = _slice_date_range(px, start_date, end_date)
 
 
 # ---------------------------------------------------------------------
@@ -133,9 +144,9 @@ st.subheader("📉 Price Context (with 200-day corridor)")
 
 fig = go.Figure()
 
-# Price line
+# Price line (WebGL: corridor history spans the full ticker history)
 fig.add_trace(
-    go.Scatter(
+    go.Scattergl(
         x=px["trade_date"],
         y=px["adj_close"],
         mode="lines",
@@ -148,7 +159,7 @@ fig.add_trace(
 if show_corridor:
     # upper band
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=px["trade_date"],
             y=px["roll_max_200d"],
             mode="lines",
@@ -161,7 +172,7 @@ if show_corridor:
 
     # lower band (fill to previous trace)
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=px["trade_date"],
             y=px["roll_min_200d"],
             mode="lines",
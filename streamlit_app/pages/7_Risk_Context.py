@@ -197,7 +197,6 @@ if show_macro_overlay:
     if macro_hist.empty:
         st.info("No rows returned from `macro_risk_dashboard` history.")
     else:
-        macro_hist = macro_hist.copy()
         if "trade_date" in macro_hist.columns:
             macro_hist["trade_date"] = pd.to_datetime(macro_hist["trade_date"])
             macro_hist = macro_hist.sort_values("trade_date")
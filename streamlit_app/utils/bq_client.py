@@ -10,10 +10,17 @@ Design goals:
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import tempfile
+import time
+from pathlib import Path
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import textwrap
 import streamlit as st
 from google.cloud import bigquery
@@ -23,7 +30,9 @@ from google.api_core.exceptions import BadRequest, Forbidden, NotFound, GoogleAP
 from config.settings import \
     GCP_PROJECT_ID, \
     GOOGLE_APPLICATION_CREDENTIALS, \
-    BQ_DATASET_MART
+    BQ_DATASET_MART, \
+    QUERY_CACHE_DIR, \
+    QUERY_CACHE_TTL
     
 # ---------------------------------------------------------------------
 # Client Factory
@@ -58,10 +67,88 @@ def get_bq_client() -> bigquery.Client:
 # Query Runner
 # ---------------------------------------------------------------------
 
+def _arrow_types_mapper(arrow_type: pa.DataType):
+    """
+    Keep STRING columns Arrow-backed instead of Python object columns.
+    Other types fall through to pyarrow's default conversion.
+    """
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def _cache_path(
+    sql: str,
+    job_config: Optional[bigquery.QueryJobConfig],
+    ttl: int,
+) -> Optional[Path]:
+    """
+    Parquet file for this (sql, parameters) pair; None when the disk cache is off.
+    The TTL is part of the name so pruning can honour each entry's own TTL.
+    """
+    if not QUERY_CACHE_DIR or ttl <= 0:
+        return None
+    api_repr = job_config.to_api_repr() if job_config is not None else {}
+    key = sql + json.dumps(api_repr, sort_keys=True, default=str)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return Path(QUERY_CACHE_DIR) / f"{digest}.{ttl}.parquet"
+
+
+def _entry_ttl(path: Path) -> int:
+    # "<digest>.<ttl>.parquet"; temp files and unknown names use the default
+    try:
+        return int(path.suffixes[-2].lstrip("."))
+    except (IndexError, ValueError):
+        return QUERY_CACHE_TTL
+
+
+def _read_cached(path: Path) -> Optional[pa.Table]:
+    try:
+        if time.time() - path.stat().st_mtime < _entry_ttl(path):
+            return pq.read_table(path)
+        path.unlink(missing_ok=True)  # expired
+    except (OSError, pa.ArrowException):
+        pass  # missing / unreadable -> query BigQuery
+    return None
+
+
+def _prune_cache(cache_dir: Path) -> None:
+    """
+    Delete expired results and temp files left by interrupted writes.
+    Most keys (custom ranges, scatter pairs) are never read again, so
+    expiry can't rely on a later read of the same key.
+    """
+    now = time.time()
+    for f in cache_dir.iterdir():
+        try:
+            if f.suffix in (".parquet", ".tmp") and now - f.stat().st_mtime >= _entry_ttl(f):
+                f.unlink(missing_ok=True)
+        except OSError:
+            pass  # raced with another writer / pruner
+
+
+def _write_cached(path: Path, table: pa.Table) -> None:
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _prune_cache(path.parent)
+        # unique temp per writer (sessions are threads of one process), then
+        # rename; atomic on local disks, not guaranteed on FUSE mounts
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+    except (OSError, pa.ArrowException):
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+        # cache is best-effort
+
+
 def run_query(
     sql: str,
     *,
     job_config: Optional[bigquery.QueryJobConfig] = None,
+    cache_ttl: Optional[int] = None,
 ) -> pd.DataFrame:
     """
     Run a SQL query against BigQuery and return a pandas DataFrame.
@@ -69,8 +156,19 @@ def run_query(
     Notes:
     - Intended for SELECT queries only
     - No side effects (no CREATE / INSERT)
+    - With QUERY_CACHE_DIR set, results are also kept as parquet for
+      cache_ttl seconds (default QUERY_CACHE_TTL; 0 skips the disk cache).
+      Callers under st.cache_data should pass their own ttl so the disk
+      copy never outlives it.
     """
 
+    ttl = QUERY_CACHE_TTL if cache_ttl is None else cache_ttl
+    cache_path = _cache_path(sql, job_config, ttl)
+    if cache_path is not None:
+        cached = _read_cached(cache_path)
+        if cached is not None:
+            return cached.to_pandas(types_mapper=_arrow_types_mapper)
+
     client = get_bq_client()
 
     # helpful when error messages don’t include the full SQL
@@ -97,7 +195,13 @@ def run_query(
                 f"sql_preview={sql_preview}\n"
             ) from e
 
-        return result.to_dataframe(create_bqstorage_client=True)
+        # Arrow straight to pandas: strings stay Arrow-backed (no object columns).
+        # Storage API read streams need google-cloud-bigquery-storage; without
+        # it the client silently falls back to paged REST/JSON downloads.
+        table = result.to_arrow(create_bqstorage_client=True)
+        if cache_path is not None:
+            _write_cached(cache_path, table)
+        return table.to_pandas(types_mapper=_arrow_types_mapper)
 
     except (BadRequest, Forbidden, NotFound, GoogleAPICallError) as e:
         # These exceptions usually contain strong hints (line/col, permissions, not found, location, etc.)
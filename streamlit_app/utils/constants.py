@@ -6,6 +6,12 @@ S0_SIGNAL_COLORS = {
     "NEUTRAL": "#BDC3C7",         # grey
     "OVEREXTENDED": "#E74C3C",    # red
 }
+# badge prefix for plain (non-Styler) tables, same palette as above
+S0_SIGNAL_BADGES = {
+    "LONG_SETUP": "🟢",
+    "NEUTRAL": "⚪",
+    "OVEREXTENDED": "🔴",
+}
 # -------------------------------------------------------------------
 # S1: Momentum / Reversion signal colors
 # -------------------------------------------------------------------
@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
 import streamlit as st
 from google.cloud import bigquery
 import pandas as pd
@@ -13,6 +16,7 @@ from config.settings import (
     TABLE_MART_RISK,
     TABLE_MART_MACRO_RISK_TS,
     TABLE_MART_MARKET_SENTIMENT_TS,
+    TABLE_MART_TABLE_BOUNDS,
 )
 
 
@@ -31,19 +35,39 @@ QUALIFY trade_date = MAX(trade_date) OVER ()
 def _param_config(params: dict):
     """
     Build BigQuery parameterized query config.
+
+    Notes:
+    - str values -> STRING scalar, list/tuple values -> ARRAY<STRING>
+      (use with `IN UNNEST(@name)`)
     """
     return bigquery.QueryJobConfig(
         query_parameters=[
-            bigquery.ScalarQueryParameter(k, "STRING", v)
+            bigquery.ArrayQueryParameter(k, "STRING", list(v))
+            if isinstance(v, (list, tuple))
+            else bigquery.ScalarQueryParameter(k, "STRING", v)
             for k, v in params.items()
         ]
     )
 
+def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast float64 -> float32 and int64 -> int32 (when values fit).
+    Halves the bytes moved through pandas ops, the cache and Plotly JSON.
+    """
+    floats = df.select_dtypes("float64").columns
+    ints = [
+        c for c in df.select_dtypes("int64").columns
+        if df[c].empty or (df[c].min() >= -(2**31) and df[c].max() < 2**31)
+    ]
+    return df.astype({
+        **{c: "float32" for c in floats},
+        **{c: "int32" for c in ints},
+    })
+
 # ---------------------------------------------------------------------
 # Overview Today Loader
 # ---------------------------------------------------------------------
-@st.cache_data(ttl=300)
-def load_overview_today():
+def _query_overview_today():
     """
     Latest 'today snapshot' for Overview page.
 
@@ -62,11 +86,10 @@ def load_overview_today():
     FROM `mag7_intel_mart.overview_today`
     ORDER BY ticker
     """
-    return run_query(sql)
+    return _downcast_numeric(run_query(sql))
 
 
-@st.cache_data(ttl=300)
-def load_overview_signal_snapshot():
+def _query_overview_signal_snapshot():
     """
     Control-center KPI snapshot for Overview page.
 
@@ -93,8 +116,7 @@ def load_overview_signal_snapshot():
     """
     return run_query(sql)
 
-@st.cache_data(ttl=300)
-def load_overview_macro_snapshot():
+def _query_overview_macro_snapshot():
     """
     Latest macro snapshot for Overview page.
 
@@ -118,8 +140,42 @@ def load_overview_macro_snapshot():
     """
     return run_query(sql)
 
+# Query bodies above stay undecorated so the bundle's worker threads never
+# touch st.cache_data (no ScriptRunContext there); the bundle caches them.
+@st.cache_data(ttl=300, show_spinner=False)
+def load_overview_bundle() -> dict[str, pd.DataFrame]:
+    """
+    Overview snapshots fetched concurrently (independent queries).
+
+    Returns:
+      {"signal": ..., "macro": ..., "today": ...}
+
+    The trending series is not bundled: its window is anchored on the
+    signal snapshot's as-of date.
+    """
+    loaders = {
+        "signal": _query_overview_signal_snapshot,
+        "macro": _query_overview_macro_snapshot,
+        "today": _query_overview_today,
+    }
+    with ThreadPoolExecutor(max_workers=len(loaders)) as ex:
+        futures = {k: ex.submit(fn) for k, fn in loaders.items()}
+        return {k: f.result() for k, f in futures.items()}
+
+TRENDING_COLUMNS = [
+    "trade_date",
+    "ticker",
+    "adj_close",
+    "return_1d",
+    "ndx_price_ratio",
+    "fear_greed",
+]
+
 @st.cache_data(ttl=300)
-def load_overview_trending(start_date: str | None = None):
+def load_overview_trending(
+    start_date: str | None = None,
+    columns: list[str] | None = None,
+):
     """
     Time-series data for Overview trending chart.
 
@@ -130,28 +186,67 @@ def load_overview_trending(start_date: str | None = None):
 
     Params:
       - start_date (YYYY-MM-DD), optional
+      - columns, optional subset of TRENDING_COLUMNS (trade_date always kept)
     """
+    select_cols = [
+        c for c in TRENDING_COLUMNS
+        if columns is None or c in columns or c == "trade_date"
+    ]
+
     where_clause = ""
+    params = {}
     if start_date:
-        where_clause = f"WHERE trade_date >= '{start_date}'"
+        where_clause = "WHERE trade_date >= DATE(@start_date)"
+        params["start_date"] = start_date
 
     sql = f"""
     SELECT
-      trade_date,
-      ticker,
-      adj_close,
-      return_1d,
-      ndx_price_ratio,
-      fear_greed
+      {", ".join(select_cols)}
     FROM `mag7_intel_mart.market_sentiment_ts`
     {where_clause}
     ORDER BY trade_date, ticker
     """
-    return run_query(sql)
+    df = _downcast_numeric(run_query(sql, job_config=_param_config(params)))
+    df["trade_date"] = pd.to_datetime(df["trade_date"])
+    return df
 
 # ---------------------------------------------------------------------
 # Market Sentiment Loaders - for Pong page
 # ---------------------------------------------------------------------
+# column name -> SELECT expression (p = prices, s = macro sentiment)
+PRICE_MACRO_COLUMNS = {
+    "open": "p.open",
+    "high": "p.high",
+    "low": "p.low",
+    "adj_close": "p.adj_close",
+    "volume": "p.volume",
+    "fwd_return_1d": "p.fwd_return_1d",
+    "fwd_return_5d": "p.fwd_return_5d",
+    "fwd_return_10d": "p.fwd_return_10d",
+    "fwd_return_20d": "p.fwd_return_20d",
+    "ma_20": "p.ma_20",
+    "ma_50": "p.ma_50",
+    "ma_200": "p.ma_200",
+    # neutral fill for viz
+    "fear_greed": "COALESCE(s.fear_greed, 50)",
+    # Fear/Greed shading zone 0..3 (same neutral fill)
+    "fg_band": """CASE
+        WHEN COALESCE(s.fear_greed, 50) < 25 THEN 0
+        WHEN COALESCE(s.fear_greed, 50) < 50 THEN 1
+        WHEN COALESCE(s.fear_greed, 50) < 75 THEN 2
+        ELSE 3
+      END""",
+    "mkt_sp500": "s.mkt_sp500",
+    "mkt_sp125": "s.mkt_sp125",
+    "stock_strength": "s.stock_strength",
+    "stock_breadth": "s.stock_breadth",
+    "put_call": "s.put_call",
+    "volatility": "s.volatility",
+    "volatility_50": "s.volatility_50",
+    "safe_haven": "s.safe_haven",
+    "junk_bonds": "s.junk_bonds",
+}
+
 @st.cache_data(ttl=600)
 def load_price_macro(
     tickers: list[str],
@@ -159,79 +254,147 @@ def load_price_macro(
     end_date: str,     # 'YYYY-MM-DD'
     prices_table: str = TABLE_FACT_PRICE_FEATS,
     macro_table: str = TABLE_FACT_MACRO,
+    columns: list[str] | None = None,
 ) -> pd.DataFrame:
     """
     Loads price + macro sentiment for selected tickers + date range.
     Uses run_query() to keep the app consistent (no bigquery.Client here).
+
+    Params:
+      - columns, optional subset of PRICE_MACRO_COLUMNS (trade_date, ticker
+        always kept); default is every column
     """
 
     if not tickers:
         return pd.DataFrame()
 
-    tickers_sql = ", ".join([f"'{t}'" for t in tickers])
+    # DATETIME arrives as an Arrow timestamp -> datetime64 column, no to_datetime pass
+    select_sql = ",\n      ".join(["DATETIME(p.trade_date) AS trade_date", "p.ticker"] + [
+        f"{expr} AS {name}"
+        for name, expr in PRICE_MACRO_COLUMNS.items()
+        if columns is None or name in columns
+    ])
 
     sql = f"""
     SELECT
-      p.trade_date,
-      p.ticker,
-      p.open,
-      p.high,
-      p.low,
-      p.adj_close,
-      p.volume,
-      p.fwd_return_1d,
-      p.fwd_return_5d,
-      p.fwd_return_10d,
-      p.fwd_return_20d,
-      p.ma_20,
-      p.ma_50,
-      p.ma_200,
-      s.fear_greed,
-      s.mkt_sp500,
-      s.mkt_sp125,
-      s.stock_strength,
-      s.stock_breadth,
-      s.put_call,
-      s.volatility,
-      s.volatility_50,
-      s.safe_haven,
-      s.junk_bonds
+      {select_sql}
     FROM `{prices_table}` p
     LEFT JOIN `{macro_table}` s
       ON p.trade_date = s.trade_date
-    WHERE p.ticker IN ({tickers_sql})
-      AND p.trade_date BETWEEN DATE('{start_date}') AND DATE('{end_date}')
+    WHERE p.ticker IN UNNEST(@tickers)
+      AND p.trade_date BETWEEN DATE(@start_date) AND DATE(@end_date)
     ORDER BY p.trade_date ASC, p.ticker ASC
     """
 
-    df = run_query(sql)
+    df = run_query(
+        sql,
+        job_config=_param_config({
+            "tickers": tickers,
+            "start_date": start_date,
+            "end_date": end_date,
+        }),
+        cache_ttl=600,
+    )
     if df is None or df.empty:
         return pd.DataFrame()
 
-    df["trade_date"] = pd.to_datetime(df["trade_date"])
+    # few distinct tickers -> small integer codes; ticker filters compare codes
+    df["ticker"] = df["ticker"].astype("category")
     return df
 
-@st.cache_data(ttl=3600)
-def load_available_tickers(prices_table: str = TABLE_FACT_PRICE_FEATS) -> list[str]:
-    sql = f"SELECT DISTINCT ticker FROM `{prices_table}` ORDER BY ticker"
-    df = run_query(sql)
-    if df is None or df.empty:
-        return []
-    return df["ticker"].tolist()
+@st.cache_data(ttl=600)
+def load_price_macro_corr(
+    ticker: str,
+    start_date: str,   # 'YYYY-MM-DD'
+    end_date: str,     # 'YYYY-MM-DD'
+    returns: tuple[str, ...],
+    indicators: tuple[str, ...],
+    prices_table: str = TABLE_FACT_PRICE_FEATS,
+    macro_table: str = TABLE_FACT_MACRO,
+) -> pd.DataFrame:
+    """
+    Pearson correlations of forward returns vs macro indicators for one ticker,
+    computed in BigQuery (one scan, one CORR() per pair).
+
+    Notes:
+    - CORR() skips pairs where either side is NULL (pairwise-complete)
+    - returns / indicators are column names of prices_table / macro_table
+
+    Returns:
+    - tidy frame: ret, ind, corr (one row per pair)
+    """
+    returns = tuple(c for c in returns if c.isidentifier())
+    indicators = tuple(c for c in indicators if c.isidentifier())
+    if not returns or not indicators:
+        return pd.DataFrame(columns=["ret", "ind", "corr"])
 
+    pairs = [(r, i) for r in returns for i in indicators]
+    corr_sql = ",\n      ".join(
+        f"CORR(p.{r}, s.{i}) AS c{k}" for k, (r, i) in enumerate(pairs)
+    )
 
-@st.cache_data(ttl=3600)
-def load_date_bounds(prices_table: str = TABLE_FACT_PRICE_FEATS) -> tuple[str, str]:
     sql = f"""
     SELECT
-      CAST(MIN(trade_date) AS STRING) AS min_date,
-      CAST(MAX(trade_date) AS STRING) AS max_date
-    FROM `{prices_table}`
+      {corr_sql}
+    FROM `{prices_table}` p
+    LEFT JOIN `{macro_table}` s
+      ON p.trade_date = s.trade_date
+    WHERE p.ticker = @ticker
+      AND p.trade_date BETWEEN DATE(@start_date) AND DATE(@end_date)
     """
-    df = run_query(sql)
-    if df is None or df.empty:
-        return ("2000-01-01", "2000-01-01")
-    return (df.loc[0, "min_date"], df.loc[0, "max_date"])
+
+    df = run_query(
+        sql,
+        job_config=_param_config({
+            "ticker": ticker,
+            "start_date": start_date,
+            "end_date": end_date,
+        }),
+        cache_ttl=600,
+    )
+    values = (
+        df.iloc[0].to_numpy(dtype="float64", na_value=float("nan"))
+        if df is not None and not df.empty
+        else [float("nan")] * len(pairs)
+    )
+    return pd.DataFrame({
+        "ret": [r for r, _ in pairs],
+        "ind": [i for _, i in pairs],
+        "corr": values,
+    })
+
+@st.cache_data(ttl=60)
+def load_sidebar_meta(
+    prices_table: str = TABLE_FACT_PRICE_FEATS,
+) -> tuple[list[str], date, date]:
+    """
+    Tickers + date bounds for the sidebar in one round-trip.
+
+    Notes:
+    - Reads the one-row summary in mart.table_bounds (rebuilt by dbt with the
+      facts), so a cold cache costs a tiny lookup, not a fact-table scan
+    - Short TTL: the lookup is cheap and picks up new trading days quickly
+
+    Returns:
+    - (tickers sorted, min_date, max_date) with dates as datetime.date
+    """
+    sql = f"""
+    SELECT
+      tickers,
+      min_date,
+      max_date
+    FROM `{TABLE_MART_TABLE_BOUNDS}`
+    WHERE tbl = @tbl
+    """
+    df = run_query(
+        sql,
+        job_config=_param_config({"tbl": prices_table.rsplit(".", 1)[-1]}),
+        cache_ttl=60,
+    )
+    if df is None or df.empty or pd.isna(df.loc[0, "min_date"]):
+        return ([], date(2000, 1, 1), date(2000, 1, 1))
+    return (list(df.loc[0, "tickers"]), df.loc[0, "min_date"], df.loc[0, "max_date"])
+
 
 # ---------------------------------------------------------------------
 # Market Sentiment Loaders
@@ -244,6 +407,8 @@ def load_market_sentiment_latest():
     sql = f"""
     SELECT trade_date, ticker
     FROM `{TABLE_MART_MARKET_SENTIMENT_TS}`
+    {LATEST_DATE_FILTER}
+    ORDER BY ticker
     """
     return run_query(sql)
 
@@ -252,20 +417,39 @@ def load_market_sentiment_history(
     ticker: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    columns: list[str] | None = None,
 ):
-    where = [f"ticker = '{ticker}'"]
+    """
+    Market & sentiment history for one ticker.
+
+    Params:
+      - columns, optional projection (trade_date always kept); default SELECT *
+    """
+    select_list = "*"
+    if columns:
+        select_cols = ["trade_date"] + [
+            c for c in columns if c != "trade_date" and c.isidentifier()
+        ]
+        select_list = ", ".join(select_cols)
+
+    where = ["ticker = @ticker"]
+    params = {"ticker": ticker}
     if start_date:
-        where.append(f"trade_date >= DATE('{start_date}')")
+        where.append("trade_date >= DATE(@start_date)")
+        params["start_date"] = start_date
     if end_date:
-        where.append(f"trade_date <= DATE('{end_date}')")
+        where.append("trade_date <= DATE(@end_date)")
+        params["end_date"] = end_date
 
     sql = f"""
-    SELECT *
+    SELECT {select_list}
     FROM `{TABLE_MART_MARKET_SENTIMENT_TS}`
     WHERE {" AND ".join(where)}
     ORDER BY trade_date
     """
-    return run_query(sql)
+    df = _downcast_numeric(run_query(sql, job_config=_param_config(params)))
+    df["trade_date"] = pd.to_datetime(df["trade_date"])
+    return df
 
 
 # ---------------------------------------------------------------------
@@ -437,13 +621,26 @@ def load_price_by_date(trade_date):
 # Price Corridor Loaders
 # ---------------------------------------------------------------------
 @st.cache_data(ttl=300)
-def load_price_corridor_history(ticker: str):
+def load_price_corridor_history(ticker: str, start_date: str | None = None):
     """
     Load adj_close price with rolling 200-day min/max corridor.
 
+    Params:
+      - start_date (YYYY-MM-DD), optional; first date returned. The scan
+        starts 300 calendar days earlier (> 200 trading rows) so the corridor
+        is identical to a full-history scan, while partitions are pruned.
+
     Returns:
       trade_date, adj_close, roll_min_200d, roll_max_200d
     """
+    date_filter = ""
+    qualify = ""
+    params = {"ticker": ticker}
+    if start_date:
+        date_filter = "AND trade_date >= DATE_SUB(DATE(@start_date), INTERVAL 300 DAY)"
+        qualify = "QUALIFY trade_date >= DATE(@start_date)"
+        params["start_date"] = start_date
+
     sql = f"""
     SELECT
       trade_date,
@@ -461,9 +658,11 @@ def load_price_corridor_history(ticker: str):
       ) AS roll_max_200d
     FROM `{TABLE_FACT_PRICES}`
     WHERE ticker = @ticker
+      {date_filter}
+    {qualify}
     ORDER BY trade_date
     """
-    return run_query(sql, job_config=_param_config({"ticker": ticker}))
+    return run_query(sql, job_config=_param_config(params))
 
 # ---------------------------------------------------------------------
 # Regime Loaders
@@ -0,0 +1,121 @@
+"""
+Small NumPy helpers shared by page figures.
+
+Design goals:
+- Pure functions (no Streamlit calls), safe to use inside cached builders
+- Operate on NumPy arrays so callers can pass column buffers directly
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------
+# Downsampling
+# ---------------------------------------------------------------------
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the positions of the points to keep (first and last are always
+    kept), so callers can subset x, y and any aligned arrays the same way.
+
+    Notes:
+    - x must be numeric and increasing (e.g. datetime64 viewed as int64)
+    - Returns all positions when the series is already short enough
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n_out - 2 interior buckets over positions [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average point of the next bucket (the last point for the final bucket)
+        nlo = hi
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean()
+        avg_y = y[nlo:nhi].mean()
+
+        # triangle area (x2) between the last kept point, candidate, next-bucket average
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+# ---------------------------------------------------------------------
+# Shading
+# ---------------------------------------------------------------------
+
+def vrect_shapes(x0s, x1s, fills, *, yref: str = "paper") -> list[dict]:
+    """
+    Build full-height background rects as plain layout shape dicts.
+
+    Notes:
+    - Pass the result to go.Figure(layout=dict(shapes=...)) or
+      fig.update_layout(shapes=...) so the shapes are validated once,
+      not once per add_vrect/add_shape call
+    - x0s / x1s / fills are aligned sequences (NumPy arrays are fine)
+    """
+    return [
+        dict(
+            type="rect",
+            xref="x",
+            yref=yref,
+            x0=x0,
+            x1=x1,
+            y0=0,
+            y1=1,
+            fillcolor=f,
+            line_width=0,
+            layer="below",
+        )
+        for x0, x1, f in zip(x0s, x1s, fills)
+    ]
+
+
+# ---------------------------------------------------------------------
+# Regression
+# ---------------------------------------------------------------------
+
+def linfit(x: np.ndarray, y: np.ndarray) -> tuple[float, float]:
+    """
+    Ordinary least-squares line y = m * x + b.
+
+    Same result as np.polyfit(x, y, 1) without building a Vandermonde
+    matrix or going through LAPACK lstsq.
+
+    Notes:
+    - Inputs must be aligned and NaN-free
+    - Returns (nan, nan) when x has zero variance
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+
+    sxx = np.dot(dx, dx)
+    if sxx == 0.0:
+        return float("nan"), float("nan")
+
+    m = np.dot(dx, y - y_mean) / sxx
+    b = y_mean - m * x_mean
+    return float(m), float(b)